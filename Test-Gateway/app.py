@@ -8,14 +8,19 @@ import time
 import io
 import threading
 import queue
+import tempfile
+import os
+from replay import iter_frames, paced_frames, frame_timestamp
+from report import LectureReport
 
 # === Configuration ===
 api_url = "http://localhost:8000/api/process-frame"
 lecture_id = "lecstring"
 
-def process_image(image_data, is_file=True):
+def process_image(image_data, is_file=True, timestamp=None):
     """Process an image through the API and return the annotated image"""
-    timestamp = datetime.datetime.now().isoformat()
+    if timestamp is None:
+        timestamp = datetime.datetime.now().isoformat()
     
     if is_file:
         # For file upload
@@ -96,6 +101,13 @@ def process_image(image_data, is_file=True):
             for line in summary_text:
                 draw.text((10, y_pos), line, fill="blue", font=font)
                 y_pos += 20
+            
+            # Fold every processed frame into the lecture report; a report
+            # failure must never hide the API result
+            try:
+                LectureReport(lecture_id).add_frame(timestamp, result)
+            except Exception as e:
+                st.warning(f"Frame not added to lecture report: {str(e)}")
                 
             return image, result
         else:
@@ -140,8 +152,28 @@ def webcam_capture(stop_event, frame_queue):
     finally:
         cap.release()
 
+def video_capture(stop_event, frame_queue, source):
+    """Replay frames from a recorded video file into the queue in real time"""
+    start = datetime.datetime.now()
+    try:
+        for offset, frame in paced_frames(iter_frames(source), 1.0, stop_event):
+            # Like the webcam, drop the oldest frame so display stays real time
+            if frame_queue.full():
+                try:
+                    frame_queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+            try:
+                frame_queue.put((frame_timestamp(start, offset), frame), block=False)
+            except queue.Full:
+                pass
+    finally:
+        # The upload was copied to disk only so OpenCV could decode it
+        os.remove(source)
+
 def process_frames():
-    """Process frames from the queue in the main thread"""
+    """Process frames from the queue in the main thread until capture stops"""
     if "webcam_running" not in st.session_state or not st.session_state.webcam_running:
         return
         
@@ -149,11 +181,21 @@ def process_frames():
     status_placeholder = st.empty()
     last_process_time = 0
     process_interval = 1.0  # Process every 1 second
+    stop_event = st.session_state.stop_event
+    capture_thread = st.session_state.get("capture_thread")
     
     try:
-        # Get the latest frame from the queue
-        if not st.session_state.frame_queue.empty():
-            timestamp, frame = st.session_state.frame_queue.get()
+        # Keep consuming in this script run; a button click reruns the script and ends the loop
+        while not stop_event.is_set():
+            try:
+                timestamp, frame = st.session_state.frame_queue.get(timeout=0.1)
+            except queue.Empty:
+                # Capture thread ended (end of recording or camera lost)
+                if capture_thread is not None and not capture_thread.is_alive():
+                    st.session_state.webcam_running = False
+                    status_placeholder.text("Capture finished")
+                    break
+                continue
             
             # Always display the current frame (smooth display)
             frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -163,7 +205,9 @@ def process_frames():
             current_time = time.time()
             if current_time - last_process_time >= process_interval:
                 status_placeholder.text("Processing frame...")
-                processed_image, result = process_image(frame, is_file=False)
+                # Replayed frames carry their recorded ISO timestamp
+                frame_time = timestamp if isinstance(timestamp, str) else None
+                processed_image, result = process_image(frame, is_file=False, timestamp=frame_time)
                 
                 if processed_image is not None:
                     # Convert PIL Image back to numpy array for display
@@ -191,7 +235,10 @@ def main():
         st.session_state.stop_event = threading.Event()
         
     # Input method selection
-    input_method = st.sidebar.radio("Select input method:", ["Upload Image", "Webcam"])
+    if st.sidebar.button("Show Lecture Report"):
+        st.sidebar.json(LectureReport(lecture_id).read())
+        
+    input_method = st.sidebar.radio("Select input method:", ["Upload Image", "Webcam", "Video File"])
     
     if input_method == "Upload Image":
         # Stop webcam if it's running
@@ -227,9 +274,45 @@ def main():
                         st.subheader("API Response")
                         st.json(result)
     
+    elif input_method == "Video File":
+        st.subheader("Video Replay")
+
+        uploaded_video = st.file_uploader("Upload a lecture recording:", type=["mp4", "avi", "mov", "mkv"])
+        st.info("Note: Replay runs in real time here; use `python replay.py <video> --speed N` for accelerated or reproducible runs.")
+
+        if not st.session_state.webcam_running:
+            if uploaded_video is not None and st.button("Start Replay"):
+                # OpenCV needs a path on disk to decode the recording
+                suffix = "." + uploaded_video.name.rsplit(".", 1)[-1]
+                with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as video_file:
+                    video_file.write(uploaded_video.getbuffer())
+
+                st.session_state.stop_event = threading.Event()
+                st.session_state.frame_queue = queue.Queue(maxsize=30)
+
+                st.session_state.webcam_running = True
+                thread = threading.Thread(
+                    target=video_capture,
+                    args=(st.session_state.stop_event, st.session_state.frame_queue, video_file.name)
+                )
+                thread.daemon = True
+                thread.start()
+                st.session_state.capture_thread = thread
+                st.rerun()
+        else:
+            if st.button("Stop Replay"):
+                st.session_state.stop_event.set()
+                st.session_state.webcam_running = False
+                st.rerun()
+
+            process_frames()
+
     else:  # Webcam input
         st.subheader("Webcam Stream")
         
+        # Warning about webcam usage
+        st.info("Note: Processing happens at 1 FPS to avoid overwhelming the API, while display remains smooth.")
+        
         # Start/stop webcam button
         if not st.session_state.webcam_running:
             if st.button("Start Webcam"):
@@ -247,6 +330,7 @@ def main():
                 )
                 thread.daemon = True
                 thread.start()
+                st.session_state.capture_thread = thread
                 st.rerun()
         else:
             if st.button("Stop Webcam"):
@@ -256,9 +340,6 @@ def main():
                 
             # Process frames in the main thread
             process_frames()
-        
-        # Warning about webcam usage
-        st.info("Note: Processing happens at 1 FPS to avoid overwhelming the API, while display remains smooth.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,184 @@
+import requests
+import argparse
+import datetime
+import json
+import os
+import time
+import cv2
+from report import LectureReport
+
+# === Configuration ===
+api_url = "http://localhost:8000/api/process-frame"
+lecture_id = "lecstring"
+replay_start = "2025-01-01T00:00:00"  # Wall-clock time of the first frame in the recording
+sequence_fps = 30.0  # Frame rate assumed for image sequences
+log_path = "replay_log.jsonl"
+request_timeout = 60  # Seconds before a hung gateway request is logged as an error
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+# === Frame Sources ===
+def iter_video(video_path):
+    """Yield (offset_seconds, frame) pairs from a recorded video file"""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video file: {video_path}")
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or sequence_fps
+    index = 0
+    try:
+        while True:
+            success, frame = cap.read()
+            if not success:
+                break
+
+            # Prefer the container timestamp, fall back to frame index / fps
+            offset_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+            offset = offset_ms / 1000.0 if offset_ms > 0 or index == 0 else index / fps
+            yield offset, frame
+            index += 1
+    finally:
+        cap.release()
+
+def iter_image_sequence(directory, fps=sequence_fps):
+    """Yield (offset_seconds, frame) pairs from a directory of images in name order"""
+    names = sorted(
+        name for name in os.listdir(directory)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    for index, name in enumerate(names):
+        frame = cv2.imread(os.path.join(directory, name))
+        if frame is None:
+            continue
+        yield index / fps, frame
+
+def iter_frames(source, fps=sequence_fps):
+    """Yield (offset_seconds, frame) pairs from a video file or an image directory"""
+    if os.path.isdir(source):
+        return iter_image_sequence(source, fps)
+    return iter_video(source)
+
+def paced_frames(frames, speed=1.0, stop_event=None):
+    """
+    Release frames according to their recorded offsets.
+
+    speed=1.0 replays in real time, speed=N replays N times faster and
+    speed=0 releases frames as fast as they can be consumed.
+    """
+    start = time.monotonic()
+    for offset, frame in frames:
+        if stop_event is not None and stop_event.is_set():
+            break
+        if speed > 0:
+            delay = offset / speed - (time.monotonic() - start)
+            if delay > 0:
+                time.sleep(delay)
+        yield offset, frame
+
+def frame_timestamp(start, offset):
+    """ISO8601 timestamp of a frame recorded `offset` seconds after `start`"""
+    return (start + datetime.timedelta(seconds=offset)).isoformat()
+
+# === Send Frame to Gateway ===
+def send_frame(frame, timestamp):
+    """POST a single frame to the gateway and return (status_code, body)"""
+    is_success, buffer = cv2.imencode(".jpg", frame)
+    if not is_success:
+        raise ValueError("Failed to encode frame")
+
+    files = {"image": ("frame.jpg", buffer.tobytes(), "image/jpeg")}
+    data = {"lectureId": lecture_id, "timestamp": timestamp}
+    response = requests.post(api_url, files=files, data=data, timeout=request_timeout)
+
+    try:
+        body = response.json()
+    except ValueError:
+        body = response.text
+    return response.status_code, body
+
+# === Run the Replay ===
+def run_replay(source, speed=1.0, log_file=log_path, start=replay_start, fps=sequence_fps, report_dir=None):
+    """Replay a recording through the gateway, logging every response as JSONL"""
+    start_time = datetime.datetime.fromisoformat(start)
+    report = None
+    if report_dir:
+        # Each replay is a complete lecture, so start its report from scratch
+        report = LectureReport(lecture_id, report_dir)
+        report.reset()
+    frame_count = 0
+    error_count = 0
+    report_errors = 0
+    total_latency = 0.0
+
+    print(f"Replaying {source} to {api_url} (speed={speed or 'max'})...")
+    wall_start = time.monotonic()
+
+    with open(log_file, "w") as log:
+        for offset, frame in paced_frames(iter_frames(source, fps), speed):
+            timestamp = frame_timestamp(start_time, offset)
+
+            request_start = time.monotonic()
+            try:
+                status_code, body = send_frame(frame, timestamp)
+            except Exception as e:
+                status_code, body = None, str(e)
+            latency = time.monotonic() - request_start
+
+            if status_code != 200:
+                error_count += 1
+            elif report is not None:
+                try:
+                    report.add_frame(timestamp, body)
+                except Exception as e:
+                    report_errors += 1
+                    print(f"Frame {frame_count} not added to report: {e}")
+            total_latency += latency
+
+            # Latency is kept out of the record so logs diff cleanly between builds
+            record = {
+                "frame": frame_count,
+                "timestamp": timestamp,
+                "status_code": status_code,
+                "response": body,
+            }
+            log.write(json.dumps(record, sort_keys=True) + "\n")
+            frame_count += 1
+
+    elapsed = time.monotonic() - wall_start
+
+    print("\nReplay Summary:")
+    print("=" * 50)
+    print(f"Frames sent: {frame_count}")
+    print(f"Errors: {error_count}")
+    print(f"Elapsed: {elapsed:.2f}s")
+    if frame_count:
+        print(f"Throughput: {frame_count / elapsed:.2f} frames/s")
+        print(f"Mean latency: {total_latency / frame_count * 1000:.1f} ms")
+    print(f"Responses logged to: {log_file}")
+    if report is not None:
+        print(f"Lecture report materialized in: {report.path} ({report_errors} frames skipped)")
+    print("=" * 50)
+
+    return {
+        "frames": frame_count,
+        "errors": error_count,
+        "elapsed": elapsed,
+        "report_errors": report_errors,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded lecture through the gateway")
+    parser.add_argument("source", help="Video file or directory of images")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Playback speed: 1 = real time, N = N times faster, 0 = as fast as possible")
+    parser.add_argument("--log", default=log_path, help="JSONL file to record responses to")
+    parser.add_argument("--start", default=replay_start, help="ISO8601 wall-clock time of the first frame")
+    parser.add_argument("--fps", type=float, default=sequence_fps, help="Frame rate for image sequences")
+    parser.add_argument("--report-dir", help="Materialize a lecture report under this directory")
+    parser.add_argument("--url", default=api_url, help="Gateway process-frame endpoint")
+    parser.add_argument("--lecture-id", default=lecture_id, help="Lecture ID sent with every frame")
+    args = parser.parse_args()
+
+    api_url = args.url
+    lecture_id = args.lecture_id
+    run_replay(args.source, args.speed, args.log, args.start, args.fps, args.report_dir)
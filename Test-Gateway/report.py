@@ -0,0 +1,318 @@
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import time
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; keep to one writer per lecture there
+    fcntl = None
+
+# === Configuration ===
+report_root = "reports"  # One sub-directory per lectureId
+page_size = 50
+
+# Per-face columns, appended once per detected face in timestamp order
+ROW_COLUMNS = {
+    "ts": np.float64,      # Frame time, seconds since the epoch
+    "person": np.int32,    # Index into summary["persons"]
+    "focused": np.uint8,   # attention_status == FOCUSED
+    "rise": np.uint8,      # Hand went up on this frame (raise count, not raised-frame count)
+}
+
+def to_seconds(timestamp):
+    """ISO8601 timestamp -> seconds since the epoch"""
+    return datetime.datetime.fromisoformat(timestamp).timestamp()
+
+def to_iso(seconds):
+    """Seconds since the epoch -> ISO8601 timestamp"""
+    return datetime.datetime.fromtimestamp(seconds).isoformat()
+
+def is_known(face):
+    """Whether the recognition service matched this face to a stored person"""
+    return face.get("recognition_status", face.get("status")) == "found"
+
+class LectureReport:
+    """
+    Lecture-level report materialized incrementally from process-frame results.
+
+    Face rows are stored column-wise as flat binary files so time-range
+    queries can memory-map them and binary-search the timestamp column.
+    Whole-lecture totals are kept up to date in summary.json, so reading a
+    full report never touches the row columns. summary.json also records how
+    many rows and frames are committed; anything past those counts is left
+    over from an interrupted ingest and is ignored by readers and truncated
+    by the next writer. Writers hold a per-lecture file lock and reload
+    summary.json under it, so several processes can ingest the same lecture.
+    """
+
+    def __init__(self, lecture_id, root=report_root):
+        self.lecture_id = lecture_id
+        self.path = os.path.join(root, lecture_id)
+        os.makedirs(self.path, exist_ok=True)
+
+        self._load_summary()
+
+    def _empty_summary(self):
+        return {
+            "lectureId": self.lecture_id,
+            "total_frames": 0,
+            "total_rows": 0,
+            "start": None,
+            "end": None,
+            "persons": [],
+        }
+
+    def _load_summary(self):
+        self.summary = self._empty_summary()
+        self.summary.update(self._load_json("summary.json", {}))
+        # person_id -> index into summary["persons"]
+        self.index = {p["person_id"]: i for i, p in enumerate(self.summary["persons"])}
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Hold the lecture's write lock with the latest committed summary loaded"""
+        with open(self._file("write.lock"), "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._load_summary()
+            yield
+        # Closing the file releases the lock
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _load_json(self, name, default):
+        try:
+            with open(self._file(name)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default
+
+    def _column(self, name, dtype=None):
+        """Memory-map the committed part of a column file"""
+        path = self._file(f"{name}.bin")
+        dtype = dtype or ROW_COLUMNS[name]
+        count = self.summary["total_frames" if name == "frames" else "total_rows"]
+        if count == 0 or not os.path.exists(path):
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+    def _truncate_uncommitted(self):
+        """Drop column data appended after the last summary write"""
+        counts = {name: self.summary["total_rows"] for name in ROW_COLUMNS}
+        counts["frames"] = self.summary["total_frames"]
+        for name, count in counts.items():
+            path = self._file(f"{name}.bin")
+            dtype = ROW_COLUMNS.get(name, np.float64)
+            if os.path.exists(path) and os.path.getsize(path) > count * np.dtype(dtype).itemsize:
+                os.truncate(path, count * np.dtype(dtype).itemsize)
+
+    def reset(self):
+        """Discard everything materialized for this lecture"""
+        with self._locked():
+            for name in list(ROW_COLUMNS) + ["frames"]:
+                path = self._file(f"{name}.bin")
+                if os.path.exists(path):
+                    os.remove(path)
+            self.summary = self._empty_summary()
+            self.index = {}
+            self._write_summary()
+
+    def _write_summary(self):
+        # Write-then-rename so readers never see a half-written summary
+        tmp_path = self._file("summary.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.summary, f)
+        os.replace(tmp_path, self._file("summary.json"))
+
+    # === Ingest ===
+    @staticmethod
+    def _parse_faces(result):
+        """Validate a process-frame result into (person_id, known, focused, hand_raised) tuples"""
+        faces = result.get("faces") if isinstance(result, dict) else None
+        if not isinstance(faces, list):
+            raise ValueError("Result has no faces list")
+
+        parsed = []
+        for face in faces:
+            if not isinstance(face, dict):
+                raise ValueError(f"Malformed face entry: {face!r}")
+            person_id = face.get("person_id")
+            if person_id is None:
+                continue
+            if not isinstance(person_id, (str, int)):
+                raise ValueError(f"Malformed person_id: {person_id!r}")
+
+            hand_status = face.get("hand_raising_status") or {}
+            if not isinstance(hand_status, dict):
+                raise ValueError(f"Malformed hand_raising_status: {hand_status!r}")
+
+            parsed.append((
+                person_id,
+                is_known(face),
+                face.get("attention_status") == "FOCUSED",
+                bool(hand_status.get("is_hand_raised", False)),
+            ))
+        return parsed
+
+    def add_frame(self, timestamp, result):
+        """Fold one process-frame result into the report"""
+        seconds = to_seconds(timestamp)
+        # Validate everything up front so a bad frame leaves the report untouched
+        faces = self._parse_faces(result)
+
+        with self._locked():
+            summary = self.summary
+            if summary["end"] is not None and seconds < summary["end"]:
+                raise ValueError(f"Frame at {timestamp} is older than the last ingested frame")
+            self._truncate_uncommitted()
+
+            rows = {name: [] for name in ROW_COLUMNS}
+            for person_id, known, focused, hand_raised in faces:
+                if person_id not in self.index:
+                    self.index[person_id] = len(summary["persons"])
+                    summary["persons"].append({
+                        "person_id": person_id,
+                        "known": known,
+                        "frames": 0,
+                        "focused_frames": 0,
+                        "hand_raises": 0,
+                        "hand_raised": False,
+                        "first_seen": seconds,
+                        "last_seen": seconds,
+                    })
+                person = summary["persons"][self.index[person_id]]
+                rise = hand_raised and not person["hand_raised"]
+
+                person["frames"] += 1
+                person["focused_frames"] += int(focused)
+                person["hand_raises"] += int(rise)
+                person["hand_raised"] = hand_raised
+                person["last_seen"] = seconds
+
+                rows["ts"].append(seconds)
+                rows["person"].append(self.index[person_id])
+                rows["focused"].append(focused)
+                rows["rise"].append(rise)
+
+            for name, dtype in ROW_COLUMNS.items():
+                with open(self._file(f"{name}.bin"), "ab") as f:
+                    np.asarray(rows[name], dtype=dtype).tofile(f)
+            with open(self._file("frames.bin"), "ab") as f:
+                np.asarray([seconds], dtype=np.float64).tofile(f)
+
+            summary["total_frames"] += 1
+            summary["total_rows"] += len(rows["ts"])
+            if summary["start"] is None:
+                summary["start"] = seconds
+            summary["end"] = seconds
+            self._write_summary()
+
+    # === Read ===
+    def _range_stats(self, start, end):
+        """Per-person aggregates for frames with start <= ts < end"""
+        lo_ts = -np.inf if start is None else to_seconds(start)
+        hi_ts = np.inf if end is None else to_seconds(end)
+        n_persons = len(self.summary["persons"])
+
+        frames = self._column("frames", np.float64)
+        total_frames = int(np.searchsorted(frames, hi_ts) - np.searchsorted(frames, lo_ts))
+
+        ts = self._column("ts")
+        lo, hi = np.searchsorted(ts, lo_ts), np.searchsorted(ts, hi_ts)
+        ts = np.asarray(ts[lo:hi])
+        person = np.asarray(self._column("person")[lo:hi])
+        focused = np.asarray(self._column("focused")[lo:hi])
+        rises = np.asarray(self._column("rise")[lo:hi])
+
+        counts = np.bincount(person, minlength=n_persons)
+        focused = np.bincount(person, weights=focused, minlength=n_persons)
+        rises = np.bincount(person, weights=rises, minlength=n_persons)
+
+        first_seen = np.full(n_persons, np.inf)
+        last_seen = np.full(n_persons, -np.inf)
+        np.minimum.at(first_seen, person, ts)
+        np.maximum.at(last_seen, person, ts)
+
+        stats = []
+        for i, p in enumerate(self.summary["persons"]):
+            if counts[i] == 0:
+                continue
+            stats.append({
+                "person_id": p["person_id"],
+                "known": p["known"],
+                "frames": int(counts[i]),
+                "focused_frames": int(focused[i]),
+                "hand_raises": int(rises[i]),
+                "first_seen": float(first_seen[i]),
+                "last_seen": float(last_seen[i]),
+            })
+        return total_frames, stats
+
+    def read(self, start=None, end=None, offset=0, limit=page_size):
+        """
+        Return the lecture report, optionally restricted to [start, end).
+
+        Students are ordered by first appearance and paginated with
+        offset/limit; attendance counts always cover every student.
+        """
+        if start is None and end is None:
+            total_frames = self.summary["total_frames"]
+            stats = self.summary["persons"]
+        else:
+            total_frames, stats = self._range_stats(start, end)
+
+        students = [
+            {
+                "person_id": s["person_id"],
+                "status": "known" if s["known"] else "new",
+                "frames": s["frames"],
+                "focus_percentage": round(100.0 * s["focused_frames"] / s["frames"], 2),
+                "hand_raises": s["hand_raises"],
+                "first_seen": to_iso(s["first_seen"]),
+                "last_seen": to_iso(s["last_seen"]),
+            }
+            for s in stats[offset:offset + limit]
+        ]
+        known = sum(1 for s in stats if s["known"])
+
+        return {
+            "lectureId": self.lecture_id,
+            "start": start,
+            "end": end,
+            "first_frame": self.summary["start"] and to_iso(self.summary["start"]),
+            "last_frame": self.summary["end"] and to_iso(self.summary["end"]),
+            "total_frames": total_frames,
+            "attendance": {
+                "total": len(stats),
+                "known": known,
+                "new": len(stats) - known,
+            },
+            "offset": offset,
+            "limit": limit,
+            "students": students,
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read a materialized lecture report")
+    parser.add_argument("lecture_id", help="Lecture ID the report was materialized for")
+    parser.add_argument("--root", default=report_root, help="Directory holding lecture reports")
+    parser.add_argument("--start", help="ISO8601 start of the time range (inclusive)")
+    parser.add_argument("--end", help="ISO8601 end of the time range (exclusive)")
+    parser.add_argument("--offset", type=int, default=0, help="Index of the first student to return")
+    parser.add_argument("--limit", type=int, default=page_size, help="Maximum number of students to return")
+    args = parser.parse_args()
+
+    if not os.path.isdir(os.path.join(args.root, args.lecture_id)):
+        print(f"No report found for lecture {args.lecture_id} in {args.root}")
+    else:
+        read_start = time.perf_counter()
+        report = LectureReport(args.lecture_id, args.root).read(args.start, args.end, args.offset, args.limit)
+        read_ms = (time.perf_counter() - read_start) * 1000
+
+        print(json.dumps(report, indent=2))
+        print(f"\nReport read in {read_ms:.1f} ms")
@@ -0,0 +1,168 @@
+import requests
+import argparse
+import datetime
+import threading
+import time
+
+# === Configuration ===
+face_image_path = "human_1.jpg"  # Single face, used for recognition and attention
+scene_image_path = "human_4.jpg"  # Person in frame, used for hand-raising
+poll_interval = 0.5  # Seconds between readiness probes
+probe_timeout = 10  # Seconds a health probe may take, matching the compose healthcheck
+ready_timeout = 300  # Give up on a service after this many seconds
+request_timeout = 60  # Seconds allowed for a single inference request
+
+# Each service: readiness probe URL, inference URL, how to build its request and
+# whether an inference request writes to the service's database
+SERVICES = {
+    "recognition": {
+        "health_url": "http://localhost:23121/",
+        "url": "http://localhost:23121/identify",
+        "image": face_image_path,
+        "file_field": "image",
+        "data": lambda: {},
+        "writes": True,  # /identify registers unknown faces as new persons
+    },
+    "attention": {
+        "health_url": "http://localhost:23123/",
+        "url": "http://localhost:23123/detect-face-attention",
+        "image": face_image_path,
+        "file_field": "file",
+        "data": lambda: {
+            "face_id": "startup_probe",
+            "lecture_id": "startup_probe",
+            "timestamp": datetime.datetime.now().isoformat(),
+        },
+        "writes": True,  # Every request stores an attention record
+    },
+    "handraising": {
+        "health_url": "http://localhost:23122/",
+        "url": "http://localhost:23122/detect-hand-raising",
+        "image": scene_image_path,
+        "file_field": "file",
+        "data": lambda: {
+            "student_id": "startup_probe",
+            "timestamp": datetime.datetime.now().isoformat(),
+        },
+        "writes": False,
+    },
+}
+
+# === Wait for Readiness ===
+def poll_until_ready(name, started, ready):
+    """Poll one health endpoint until it answers 200 and record seconds since `started`"""
+    while time.monotonic() - started < ready_timeout:
+        try:
+            if requests.get(SERVICES[name]["health_url"], timeout=probe_timeout).status_code == 200:
+                ready[name] = time.monotonic() - started
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(poll_interval)
+
+def wait_until_ready(names, started):
+    """
+    Poll every health endpoint concurrently until each answers 200.
+
+    Returns {name: seconds since `started`}; services that never become
+    ready within `ready_timeout` are left out.
+    """
+    ready = {}
+    threads = [threading.Thread(target=poll_until_ready, args=(name, started, ready)) for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name in names:
+        if name not in ready:
+            print(f"{name} did not become ready within {ready_timeout}s")
+    return ready
+
+# === Time a Single Inference ===
+def timed_request(service):
+    """Send one inference request; return (status_code, latency_seconds), status None on failure"""
+    with open(service["image"], "rb") as image_file:
+        files = {service["file_field"]: ("image.jpg", image_file, "image/jpeg")}
+        request_start = time.monotonic()
+        try:
+            response = requests.post(service["url"], files=files, data=service["data"](),
+                                     timeout=request_timeout)
+            status_code = response.status_code
+        except requests.exceptions.RequestException as e:
+            print(f"Request to {service['url']} failed: {e}")
+            status_code = None
+        return status_code, time.monotonic() - request_start
+
+# === Run the Cold Start Measurement ===
+def run_test(names, warm_requests=5, allow_writes=False):
+    """
+    Report time-to-ready, first-request latency and warm latency per service.
+
+    Start this right after `docker compose up -d` or `docker compose restart`
+    so time-to-ready covers model loading; a first request much slower than
+    the warm median means warm-up is still happening on the request path.
+
+    Recognition and attention store what they are sent, so their latency is
+    only probed with allow_writes; otherwise just their ready time is reported.
+    """
+    started = time.monotonic()
+    ready = wait_until_ready(names, started)
+    results = {name: {"ready_after": ready[name]} for name in names if name in ready}
+
+    # Latency probes only start once every service's ready time is recorded
+    for name in results:
+        service = SERVICES[name]
+        if service["writes"] and not allow_writes:
+            print(f"{name}: skipping latency probes, they write to its database (use --allow-writes)")
+            continue
+
+        status_code, first_latency = timed_request(service)
+        if status_code != 200:
+            print(f"{name}: first request failed with status {status_code}")
+            continue
+
+        # Fast error responses would make a broken service look warm
+        warm = [timed_request(service) for _ in range(warm_requests)]
+        warm_latencies = sorted(latency for status_code, latency in warm if status_code == 200)
+        if len(warm_latencies) < len(warm):
+            print(f"{name}: {len(warm) - len(warm_latencies)} of {len(warm)} warm requests failed")
+        if not warm_latencies:
+            continue
+        warm_median = warm_latencies[len(warm_latencies) // 2]
+
+        results[name].update({
+            "first_request": first_latency,
+            "warm_median": warm_median,
+        })
+
+    print("\nCold Start Summary:")
+    print("=" * 70)
+    print(f"{'Service':<14}{'Ready after':>14}{'First request':>16}{'Warm median':>14}{'Ratio':>10}")
+    for name, r in results.items():
+        if "warm_median" not in r:
+            print(f"{name:<14}{r['ready_after']:>13.2f}s{'-':>16}{'-':>14}{'-':>10}")
+            continue
+        ratio = r["first_request"] / r["warm_median"] if r["warm_median"] else float("inf")
+        print(
+            f"{name:<14}{r['ready_after']:>13.2f}s"
+            f"{r['first_request'] * 1000:>14.1f}ms"
+            f"{r['warm_median'] * 1000:>12.1f}ms"
+            f"{ratio:>9.1f}x"
+        )
+    print("=" * 70)
+
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure model service startup and first-request latency")
+    parser.add_argument("services", nargs="*", default=list(SERVICES), choices=list(SERVICES),
+                        help="Services to measure (default: all)")
+    parser.add_argument("--warm-requests", type=int, default=5,
+                        help="Requests used to compute the warm median latency")
+    parser.add_argument("--allow-writes", action="store_true",
+                        help="Also probe recognition and attention, which store a person / attention "
+                             "records under 'startup_probe' in their databases")
+    args = parser.parse_args()
+
+    run_test(args.services, args.warm_requests, args.allow_writes)